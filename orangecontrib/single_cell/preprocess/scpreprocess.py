@@ -217,6 +217,8 @@ class DropoutWarning(Warning):
 
 
 class DropoutGeneSelection(Preprocess):
+    BLOCK_SIZE = 2 ** 18  # number of values processed at once in dense data
+
     def __init__(self, n_genes=None, decay=1, x_offset=5, y_offset=0.02,
                  threshold=0, at_least=0):
         self.n_genes = n_genes
@@ -229,61 +231,112 @@ class DropoutGeneSelection(Preprocess):
     def __call__(self, data: Table) -> Table:
         zero_rate, mean_expr = self.detection(data.X)
         selected = self.select_genes(zero_rate, mean_expr)
-        if sum(selected) < self.n_genes:
-            warnings.warn(f"{sum(selected)} genes selected", DropoutWarning)
+        n_selected = np.count_nonzero(selected)
+        if n_selected < self.n_genes:
+            warnings.warn(f"{n_selected} genes selected", DropoutWarning)
         return self.filter_columns(data, selected)
 
     def detection(self, table: AnyArray) -> Tuple[np.ndarray, np.ndarray]:
-        with np.errstate(invalid="ignore"):  # comparison can include nans
-            mask = table > self.threshold
-
         if sp.issparse(table):
-            A = table.copy()
-            np.log2(A.data, out=A.data)
+            n_detected, log_mean = self.__sparse_stats(table)
         else:
-            A = np.ma.log2(table)  # avoid log2(0)
-            A.mask = False
+            n_detected, log_mean = self.__dense_stats(table)
 
-        detection_rate = ut.nanmean(mask, axis=0)
+        detection_rate = n_detected / table.shape[0]
         zero_rate = 1 - detection_rate
         detected = detection_rate > 0
-        detected_mean = ut.nanmean(A[:, detected], axis=0)
 
         mean_expr = np.full_like(zero_rate, fill_value=np.nan)
-        mean_expr[detected] = detected_mean / detection_rate[detected]
+        mean_expr[detected] = log_mean[detected] / detection_rate[detected]
 
-        low_detection = np.array(np.sum(mask, axis=0)).squeeze()
-        zero_rate[low_detection < self.at_least] = np.nan
-        mean_expr[low_detection < self.at_least] = np.nan
+        zero_rate[n_detected < self.at_least] = np.nan
+        mean_expr[n_detected < self.at_least] = np.nan
         return zero_rate, mean_expr
 
+    def __dense_stats(self, table: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Process blocks of columns, so that the gathered nonzero values
+        # stay small enough to be cached instead of spanning the whole table
+        n, m = table.shape
+        step = max(1, self.BLOCK_SIZE // max(n, 1))
+        n_detected = np.empty(m, dtype=int)
+        log_mean = np.empty(m)
+        for start in range(0, m, step):
+            block = table[:, start:start + step]
+            rows, cols = np.nonzero(block)
+            n_detected[start:start + step], log_mean[start:start + step] = \
+                self.__column_stats(cols, block[rows, cols], *block.shape)
+        return n_detected, log_mean
+
+    def __sparse_stats(self, table: AnyArray) -> Tuple[np.ndarray, np.ndarray]:
+        # the reduction needs only the column of each stored value, so
+        # neither CSR nor CSC input has to be converted
+        if table.format not in ("csr", "csc"):
+            table = table.tocsr()
+        elif not table.has_canonical_format:  # duplicates would be counted
+            table = table.copy()
+            table.sum_duplicates()
+        n, m = table.shape
+        if table.format == "csr":
+            cols = table.indices
+        else:
+            cols = np.repeat(np.arange(m), np.diff(table.indptr))
+        return self.__column_stats(cols, table.data, n, m)
+
+    def __column_stats(self, cols: np.ndarray, values: np.ndarray,
+                       n: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count detections and average log2 expression in m columns of n rows,
+        given only the nonzero values and their columns. Values without a
+        logarithm (nans, negative values) are left out of the average.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n_detected = np.bincount(cols[values > self.threshold],
+                                     minlength=m)
+            logs = np.log2(values)
+        nans = np.isnan(logs)
+        log_sum = np.bincount(cols[~nans], weights=logs[~nans], minlength=m)
+        n_valid = n - np.bincount(cols[nans], minlength=m)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return n_detected, log_sum / n_valid
+
     def select_genes(self, zero_rate: np.ndarray,
                      mean_expr: np.ndarray) -> np.ndarray:
-        args = (mean_expr, zero_rate)
-        return self.__get_selected(*args) if self.n_genes is None \
-            else self.__bisection(*args)
+        # genes without statistics are never selected
+        nonan = ~np.isnan(zero_rate)
+        args = (mean_expr[nonan], zero_rate[nonan])
+        if self.n_genes is not None:
+            self.__fit_x_offset(*args)
+        selected = np.zeros(len(zero_rate), dtype=bool)
+        selected[nonan] = self.__get_selected(*args)
+        return selected
 
-    def __bisection(self, mean_expr, zero_rate):
+    def __fit_x_offset(self, mean_expr, zero_rate):
+        """
+        Set x_offset in [0, 10] so that n_genes genes lie above the curve.
+
+        For decay > 0, a gene lies above the curve iff x_offset is below its
+        score, mean_expr + log(zero_rate - y_offset) / decay. x_offset is put
+        between the n-th largest score and the next smaller distinct score,
+        so genes tied with the n-th are all selected.
+        """
+        if self.decay <= 0:  # the curve is not decreasing; keep x_offset
+            return
         low, up = 0, 10
-        for t in range(100):
-            selected = self.__get_selected(mean_expr, zero_rate)
-            if np.sum(selected) == self.n_genes:
-                break
-            elif np.sum(selected) < self.n_genes:
-                up = self.x_offset
-                self.x_offset = (self.x_offset + low) / 2
-            else:
-                low = self.x_offset
-                self.x_offset = (self.x_offset + up) / 2
-        return selected
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = mean_expr + np.log(zero_rate - self.y_offset) / self.decay
+        scores = np.nan_to_num(scores, nan=-np.inf)
+        n = min(self.n_genes, len(scores))
+        if n == 0:
+            nth = np.inf
+        else:
+            nth = np.partition(scores, len(scores) - n)[len(scores) - n]
+        below = scores[scores < nth].max(initial=-np.inf)
+        x_offset = (max(below, low) + min(nth, up)) / 2
+        self.x_offset = float(np.clip(x_offset, low, up))
 
     def __get_selected(self, mean_expr, zero_rate):
-        nonan = ~np.isnan(zero_rate)
-        sel = np.zeros_like(zero_rate).astype(bool)
-        x = mean_expr[nonan]
-        y = self.y(x, self.decay, self.x_offset, self.y_offset)
-        sel[nonan] = (zero_rate[nonan] > y)
-        return sel
+        y = self.y(mean_expr, self.decay, self.x_offset, self.y_offset)
+        return zero_rate > y
 
     @staticmethod
     def y(x, decay, x_offset, y_offset):
@@ -291,6 +344,11 @@ class DropoutGeneSelection(Preprocess):
 
     @staticmethod
     def filter_columns(data: Table, mask: np.ndarray) -> Table:
+        # mask can also be an array of column indices; gather only the
+        # selected attributes instead of converting all of them to an array
         domain = data.domain
-        return data.transform(Domain(tuple(np.array(domain.attributes)[mask]),
-                                     domain.class_vars,  domain.metas))
+        mask = np.asarray(mask)
+        indices = np.flatnonzero(mask) if mask.dtype == bool else mask
+        attributes = tuple(domain.attributes[i] for i in indices)
+        return data.transform(Domain(attributes,
+                                     domain.class_vars, domain.metas))
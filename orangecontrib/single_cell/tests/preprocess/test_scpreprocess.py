@@ -1,8 +1,10 @@
 import warnings
 import os
 import unittest
+from unittest.mock import patch
 import numpy as np
 import numpy.testing as npt
+import scipy.sparse as sp
 
 from Orange.data import Table, Domain
 from Orange.widgets.tests.utils import table_dense_sparse
@@ -256,6 +258,63 @@ class TestDropoutGeneSelection(unittest.TestCase):
             atol=1e-7,
         )
 
+    def test_detection_sparse_equals_dense(self):
+        X = self.table.X.copy()
+        X[::7, 3] = np.nan
+        X[::5, 2] = -1
+        preprocessor = DropoutGeneSelection(threshold=1, at_least=10)
+        dense = preprocessor.detection(X)
+        for sparse in (sp.csr_matrix(X), sp.csc_matrix(X), sp.coo_matrix(X)):
+            for dense_res, sparse_res in zip(dense,
+                                             preprocessor.detection(sparse)):
+                npt.assert_allclose(dense_res, sparse_res)
+
+    def test_detection_blocks(self):
+        preprocessor = DropoutGeneSelection(threshold=1)
+        expected = preprocessor.detection(self.table.X)
+        n_rows = len(self.table)
+        for block_size in (1, n_rows, 3 * n_rows + 1):
+            with patch.object(DropoutGeneSelection, "BLOCK_SIZE", block_size):
+                actual = preprocessor.detection(self.table.X)
+            for exp, act in zip(expected, actual):
+                npt.assert_allclose(exp, act)
+
+    def test_detection_float32(self):
+        preprocessor = DropoutGeneSelection()
+        X = self.table.X
+        for expected, actual in zip(
+                preprocessor.detection(X),
+                preprocessor.detection(X.astype(np.float32))):
+            self.assertEqual(actual.dtype, np.float64)
+            npt.assert_allclose(expected, actual, rtol=1e-6)
+
+    def test_select_genes_n_genes(self):
+        zero_rate, mean_expr = DropoutGeneSelection().detection(self.table.X)
+        for n_genes in (0, 1, 5, 10):
+            preprocessor = DropoutGeneSelection(n_genes)
+            selected = preprocessor.select_genes(zero_rate, mean_expr)
+            self.assertEqual(np.count_nonzero(selected), n_genes)
+            self.assertTrue(0 <= preprocessor.x_offset <= 10)
+            # selection matches the curve with the fitted x_offset
+            fitted = DropoutGeneSelection(x_offset=preprocessor.x_offset)
+            npt.assert_array_equal(
+                fitted.select_genes(zero_rate, mean_expr), selected)
+
+    def test_select_genes_n_genes_ties(self):
+        # each gene appears twice, so scores come in tied pairs
+        X = np.hstack((self.table.X, self.table.X))
+        zero_rate, mean_expr = DropoutGeneSelection().detection(X)
+        for n_genes in (0, 1, 2, 5, 10):
+            preprocessor = DropoutGeneSelection(n_genes)
+            selected = preprocessor.select_genes(zero_rate, mean_expr)
+            # tied genes are selected together
+            npt.assert_array_equal(*np.split(selected, 2))
+            self.assertEqual(np.count_nonzero(selected),
+                             n_genes + n_genes % 2)
+            fitted = DropoutGeneSelection(x_offset=preprocessor.x_offset)
+            npt.assert_array_equal(
+                fitted.select_genes(zero_rate, mean_expr), selected)
+
     @table_dense_sparse
     def test_warning(self, prepare_table):
         n_genes = 30
@@ -267,6 +326,16 @@ class TestDropoutGeneSelection(unittest.TestCase):
         dropout_warnings = [warning for warning in w if issubclass(warning.category, DropoutWarning)]
         self.assertEqual(len(dropout_warnings), 1)
 
+    def test_filter_columns(self):
+        mask = np.zeros(len(self.table.domain.attributes), dtype=bool)
+        mask[[1, 4, 5]] = True
+        by_mask = DropoutGeneSelection.filter_columns(self.table, mask)
+        by_index = DropoutGeneSelection.filter_columns(
+            self.table, np.flatnonzero(mask))
+        self.assertEqual(by_mask.domain, by_index.domain)
+        npt.assert_array_equal(by_mask.X, self.table.X[:, [1, 4, 5]])
+        npt.assert_array_equal(by_index.X, self.table.X[:, [1, 4, 5]])
+
     @table_dense_sparse
     def test_preserves_density(self, prepare_table):
         table = prepare_table(self.table)
@@ -75,6 +75,35 @@ class TestDropoutGraph(WidgetTest):
         self.graph.update_markers(self.data, self.genes)
         self.assertEqual(len(self.graph.plotItem.items), 3)
 
+    def test_set_data_range(self):
+        self.results.mean_expr = np.array([0.1, 3.5])
+        self.results.threshold = 2
+        self.graph.set_data(self.results, self.data, None)
+        (xmin, xmax), (ymin, ymax) = self.graph.viewRange()
+        self.assertAlmostEqual(xmin, 1)
+        self.assertAlmostEqual(xmax, 4)
+        self.assertAlmostEqual(ymin, 0)
+        self.assertAlmostEqual(ymax, 1)
+
+    def test_set_data_many_genes(self):
+        n_genes = DropoutGraph.MAX_DOTS + 1000
+        x = np.random.RandomState(0).random((2, n_genes))
+        data = Table(Domain([ContinuousVariable(f"G{i}")
+                             for i in range(n_genes)]),
+                     np.ones((2, n_genes)))
+        attrs = data.domain.attributes
+        attrs[3].attributes["Entrez ID"] = "1"
+        results = Mock(mean_expr=x[0], zero_rate=x[1], threshold=0,
+                       decay=1, x_offset=0.1, y_offset=0.1)
+        self.graph.set_data(results, data, self.genes)
+        dots, markers = self.graph.plotItem.items[:2]
+        points = dots.points()
+        self.assertLess(len(points), n_genes)
+        for point in points[:10]:
+            var = point.data()[0]
+            self.assertEqual(point.pos().x(), x[0, attrs.index(var)])
+        self.assertEqual(markers.getData()[0][0], x[0, 3])
+
     def test_update_curve(self):
         self.graph.update_curve(self.results)
         self.assertEqual(len(self.graph.plotItem.items), 1)
@@ -85,6 +114,17 @@ class TestDropoutGraph(WidgetTest):
         self.graph.update_curve(self.results)
         self.assertEqual(len(self.graph.plotItem.items), 2)
 
+    def test_update_curve_reuses_item(self):
+        self.graph.set_data(self.results, self.data, None)
+        curve = self.graph.plotItem.items[1]
+        self.results.x_offset = 0.5
+        self.graph.update_curve(self.results)
+        self.graph.clear_all()
+        self.graph.set_data(self.results, self.data, None)
+        self.assertIs(self.graph.plotItem.items[1], curve)
+        x, y = curve.getData()
+        np.testing.assert_allclose(y, np.exp(-(x - 0.5)) + 0.1)
+
     def test_update_markers(self):
         self.graph.update_markers(self.data, self.genes)
         self.assertEqual(len(self.graph.plotItem.items), 0)
@@ -159,6 +199,7 @@ class TestOWDropout(WidgetTest):
     @patch("orangecontrib.single_cell.widgets.owdropout."
            "DropoutGraph.set_data")
     def test_input_genes(self, set_data: Mock, update_markers: Mock):
+        self.widget.show()
         # genes
         self.send_signal(self.widget.Inputs.genes, self.genes)
         update_markers.assert_called_once_with(None, self.genes)
@@ -211,6 +252,7 @@ class TestOWDropout(WidgetTest):
     @patch("orangecontrib.single_cell.widgets.owdropout."
            "DropoutGraph.set_data")
     def test_manual_move(self, set_data: Mock, update_curve: Mock):
+        self.widget.show()
         self.send_signal(self.widget.Inputs.data, self.data)
         set_data.assert_called_once()
         update_curve.assert_not_called()
@@ -225,6 +267,30 @@ class TestOWDropout(WidgetTest):
         self.assertTrue(controls.x_offset.isEnabled())
         self.assertTrue(controls.y_offset.isEnabled())
 
+    @patch("orangecontrib.single_cell.widgets.owdropout."
+           "DropoutGraph.update_markers")
+    @patch("orangecontrib.single_cell.widgets.owdropout."
+           "DropoutGraph.update_curve")
+    @patch("orangecontrib.single_cell.widgets.owdropout."
+           "DropoutGraph.set_data")
+    def test_hidden_graph(self, set_data: Mock, update_curve: Mock,
+                          update_markers: Mock):
+        self.send_signal(self.widget.Inputs.data, self.data)
+        self.send_signal(self.widget.Inputs.genes, self.genes)
+        self.widget.controls.filter_type.buttons[1].click()
+        set_data.assert_not_called()
+        update_curve.assert_not_called()
+        update_markers.assert_not_called()
+
+        self.widget.show()
+        set_data.assert_called_once()
+        self.assertIs(set_data.call_args[0][1], self.data)
+        self.widget.hide()
+        self.widget.show()
+        set_data.assert_called_once()
+        update_curve.assert_not_called()
+        update_markers.assert_not_called()
+
     def test_output(self):
         self.send_signal(self.widget.Inputs.data, self.data)
         output = self.get_output(self.widget.Outputs.data)
@@ -249,11 +315,33 @@ class TestOWDropout(WidgetTest):
         self.widget.controls.n_genes.setValue(100)
         self.send_signal(self.widget.Inputs.data, self.data)
         self.widget.controls.n_genes.setValue(200)
+        self.widget.controls.n_genes.setValue(300)
+        self.widget.controls.n_genes.setValue(200)
+        self.assertTrue(self.widget._paramtimer.isActive())
+        output = self.get_output(self.widget.Outputs.data)
+        self.assertEqual(len(output.domain.attributes), 100)
+        self.process_events(lambda: not self.widget._paramtimer.isActive())
         output = self.get_output(self.widget.Outputs.data)
         self.assertEqual(len(output.domain.attributes), 200)
         self.send_signal(self.widget.Inputs.data, None)
         self.widget.controls.n_genes.setValue(100)
 
+    def test_commit_unchanged_selection(self):
+        self.send_signal(self.widget.Inputs.data, self.data)
+        output = self.get_output(self.widget.Outputs.data)
+        self.widget.controls.n_genes.setValue(200)
+        self.widget.controls.n_genes.setValue(497)
+        self.process_events(lambda: not self.widget._paramtimer.isActive())
+        self.assertIs(self.get_output(self.widget.Outputs.data), output)
+
+        self.widget.controls.n_genes.setValue(200)
+        self.process_events(lambda: not self.widget._paramtimer.isActive())
+        output = self.get_output(self.widget.Outputs.data)
+        self.assertEqual(len(output.domain.attributes), 200)
+
+        self.send_signal(self.widget.Inputs.data, self.data)
+        self.assertIsNot(self.get_output(self.widget.Outputs.data), output)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,9 @@
 from collections import namedtuple
+from typing import Callable, Tuple
 import numpy as np
 
-from AnyQt.QtCore import Qt, QSize, QRectF, QPointF, pyqtSignal as Signal
+from AnyQt.QtCore import Qt, QSize, QRectF, QPointF, QTimer, \
+    pyqtSignal as Signal
 from AnyQt.QtGui import QColor, QMouseEvent
 from AnyQt.QtWidgets import QHBoxLayout, QVBoxLayout, QToolTip, \
     QGraphicsSceneMouseEvent
@@ -12,6 +14,7 @@ from Orange.data import Table
 from Orange.widgets import gui, report
 from Orange.widgets.settings import Setting, ContextSetting, \
     DomainContextHandler
+from Orange.widgets.utils.localization import pl
 from Orange.widgets.visualize.utils.plotutils import MouseEventDelegate
 from Orange.widgets.widget import OWWidget, Input, Output, Msg
 
@@ -29,20 +32,33 @@ class States:
 
 
 class DropoutGraph(pg.PlotWidget):
-    pg.setConfigOption("foreground", "k")
-
     curve_moved = Signal(float, float)
     CURVE_PEN = pg.mkPen(color=QColor(Qt.darkCyan), width=4)
     MOVING_CURVE_PEN = pg.mkPen(color=QColor(179, 215, 255), width=4)
+    CURVE_POINTS = 512
+    MAX_DOTS = 5000
+    DOTS_BINS = 300
 
     def __init__(self, parent):
+        # set on construction rather than when the module is imported for
+        # widget discovery; must precede creation of the axes
+        pg.setConfigOption("foreground", "k")
         super().__init__(parent, background="w")
-        self.__dots = None  # type: pg.ScatterPlotItem
-        self.__markers = None  # type: pg.ScatterPlotItem
-        self.__curve = None  # type: pg.PlotCurveItem
+        # plot items are created once and updated with setData
+        self.__dots = pg.ScatterPlotItem(size=5)
+        self.__coords = None  # type: Tuple[np.ndarray, np.ndarray]
+        self.__markers = pg.ScatterPlotItem(
+            size=7, brush=pg.mkBrush(color=QColor(Qt.magenta)))
+        self.__curve = pg.PlotCurveItem(
+            fillLevel=1, pen=self.CURVE_PEN,
+            brush=pg.mkBrush(color=QColor(0, 250, 0, 50)), antialias=True)
+        # the curve is redrawn on every parameter change; reuse its buffers
+        self.__curve_x = np.empty(self.CURVE_POINTS)
+        self.__curve_y = np.empty(self.CURVE_POINTS)
         self.__decay = None  # type: float
         self.__x_offset = None  # type: float
         self.__y_offset = None  # type: float
+        self.__xlim = None  # type: Tuple[float, float]
         self._initial_x = None  # type: float
         self._initial_y = None  # type: float
         self._state = States.WAITING
@@ -55,64 +71,93 @@ class DropoutGraph(pg.PlotWidget):
         self.scene().installEventFilter(self._delegate)
 
     def set_data(self, results: DropoutResults, data: Table, genes: Table):
+        self.__set_xlim(results)
         self.__plot_dots(results.mean_expr, results.zero_rate, data)
         self.update_markers(data, genes)
         self.update_curve(results)
-        self.__set_range(results.threshold, results.mean_expr)
+        self.__set_range()
 
     def update_markers(self, data: Table, genes: Table):
         self.removeItem(self.__markers)
-        if data is None or self.__dots is None or genes is None:
+        if data is None or self.__coords is None or genes is None:
             return
-        x, y = self.__dots.getData()
-        self.__plot_markers(x, y, data, genes)
+        self.__plot_markers(*self.__coords, data, genes)
 
     def update_curve(self, results: DropoutResults):
         self.__set_curve_params(results)
         self.__plot_curve(results)
 
     def __plot_dots(self, x: np.ndarray, y: np.ndarray, data: Table):
+        self.__coords = x, y
         data = list(zip(data.domain.attributes,
                         (data.X > 0).sum(axis=0),
                         np.full_like(y, len(data))))
-        self.__dots = pg.ScatterPlotItem(x=x, y=y, size=5, data=data)
-        self.addItem(self.__dots)
+        if len(x) > self.MAX_DOTS:
+            shown = self.__thin_out(x, y, self.DOTS_BINS)
+            x, y, data = x[shown], y[shown], [data[i] for i in shown]
+        self.__dots.setData(x=x, y=y, data=data)
+        self.__add_item(self.__dots)
+
+    @staticmethod
+    def __thin_out(x: np.ndarray, y: np.ndarray, bins: int) -> np.ndarray:
+        """
+        Return indices of one point per occupied cell of a bins x bins grid.
+        At plot resolution the omitted points overlap the shown ones.
+        """
+        finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        if not len(finite):
+            return finite
+        cells = np.zeros(len(finite), dtype=int)
+        for v in (x[finite], y[finite]):
+            vmin, vmax = v.min(), v.max()
+            scale = bins / (vmax - vmin) if vmax > vmin else 0
+            cells = cells * bins + \
+                np.minimum(((v - vmin) * scale).astype(int), bins - 1)
+        _, first = np.unique(cells, return_index=True)
+        return finite[np.sort(first)]
 
     def __plot_markers(self, x: np.ndarray, y: np.ndarray,
                        data: Table, markers: Table):
         col = markers.get_column(ENTREZ_ID)
         mask = [str(a.attributes.get(ENTREZ_ID, None)) in col
                 for a in data.domain.attributes]
-        self.__markers = pg.ScatterPlotItem(
-            x=x[mask], y=y[mask], size=7,
-            brush=pg.mkBrush(color=QColor(Qt.magenta)))
-        self.addItem(self.__markers)
+        self.__markers.setData(x=x[mask], y=y[mask])
+        self.__add_item(self.__markers)
 
     def __set_curve_params(self, results: DropoutResults):
         self.__decay = results.decay
         self.__x_offset = results.x_offset
         self.__y_offset = results.y_offset
 
+    def __set_xlim(self, results: DropoutResults):
+        self.__xlim = self.__get_xlim(results.threshold, results.mean_expr)
+        self.__curve_x[:] = np.linspace(*self.__xlim, self.CURVE_POINTS)
+
     def __plot_curve(self, results: DropoutResults):
-        self.removeItem(self.__curve)
-        xmin, xmax = self.__get_xlim(results.threshold, results.mean_expr)
-        x = np.arange(xmin, xmax + 0.01, 0.01)
-        y = np.exp(-results.decay * (x - results.x_offset)) + results.y_offset
+        if self.__xlim is None:
+            self.__set_xlim(results)
+        x, y = self.__curve_x, self.__curve_y
+        # DropoutGeneSelection.y, evaluated in place
+        np.subtract(x, results.x_offset, out=y)
+        y *= -results.decay
+        np.exp(y, out=y)
+        y += results.y_offset
         pen = self.MOVING_CURVE_PEN if self._state == States.MOVING_CURVE \
             else self.CURVE_PEN
-        self.__curve = pg.PlotCurveItem(
-            x=x, y=y, fillLevel=1, pen=pen,
-            brush=pg.mkBrush(color=QColor(0, 250, 0, 50)),
-            antialias=True)
-        self.addItem(self.__curve)
-
-    def __set_range(self, threshold: float, x: np.ndarray):
-        xmin, xmax = self.__get_xlim(threshold, x)
-        rect = QRectF(xmin, 0, xmin + xmax, 1)
+        self.__curve.setData(x=x, y=y, pen=pen)
+        self.__add_item(self.__curve)
+
+    def __add_item(self, item: pg.GraphicsObject):
+        if item not in self.plotItem.items:
+            self.addItem(item)
+
+    def __set_range(self):
+        xmin, xmax = self.__xlim
+        rect = QRectF(xmin, 0, xmax - xmin, 1)
         self.setRange(rect, padding=0)
 
     def help_event(self, ev):
-        if self.__dots is None:
+        if self.__coords is None:
             return False
         dot = self._dotAt(self.__dots.mapFromScene(ev.scenePos()))
         if dot is not None and dot.data() is not None:
@@ -137,7 +182,7 @@ class DropoutGraph(pg.PlotWidget):
         return None
 
     def cursor_event(self, ev: QGraphicsSceneMouseEvent):
-        if self.__curve is None:
+        if self.__decay is None:
             return False
         if self._state == States.HOLDING_CURVE:
             return False
@@ -163,7 +208,7 @@ class DropoutGraph(pg.PlotWidget):
         return False
 
     def _on_curve(self, x: float, y: float):
-        if self.__curve is None:
+        if self.__decay is None:
             return False
         return abs(DropoutGeneSelection.y(
             x, self.__decay, self.__x_offset, self.__y_offset) - y) < 0.01
@@ -187,11 +232,11 @@ class DropoutGraph(pg.PlotWidget):
 
     def clear_all(self):
         self.clear()
-        self.__dots = None
-        self.__curve = None
+        self.__coords = None
         self.__decay = None
         self.__x_offset = None
         self.__y_offset = None
+        self.__xlim = None
 
     @staticmethod
     def __get_xlim(threshold: float, x: np.ndarray):
@@ -239,6 +284,13 @@ class OWDropout(OWWidget):
         self.zero_rate = None  # type: np.ndarray
         self.mean_expr = None  # type: np.ndarray
         self.selected = None  # type: np.ndarray
+        self.__selected_idx = None  # type: np.ndarray
+        self.__sent_selected = None  # type: np.ndarray
+        self.__results = None  # type: DropoutResults
+        self.__graph_outdated = False
+        # coalesce bursts of spin box edits into a single update
+        self._paramtimer = QTimer(self, singleShot=True, interval=150)
+        self._paramtimer.timeout.connect(self.__update_params)
         self.setup_gui()
 
     def setup_gui(self):
@@ -293,9 +345,13 @@ class OWDropout(OWWidget):
 
     def __filter_type_changed(self):
         self.enable_controls()
-        self.__param_changed()
+        self.__update_params()
 
     def __param_changed(self):
+        self._paramtimer.start()
+
+    def __update_params(self):
+        self._paramtimer.stop()
         self.update_selection()
         self.setup_info_label()
         self.commit.deferred()
@@ -316,8 +372,10 @@ class OWDropout(OWWidget):
 
     @Inputs.data
     def set_data(self, data):
+        self._paramtimer.stop()
         self.closeContext()
         self.data = data
+        self.__sent_selected = None
         self.openContext(data)
         self.select_genes()
         self.setup_info_label()
@@ -327,7 +385,7 @@ class OWDropout(OWWidget):
     def set_genes(self, genes):
         self.genes = genes
         self.check_genes()
-        self.graph.update_markers(self.data, self.genes)
+        self.__draw(lambda: self.graph.update_markers(self.data, self.genes))
 
     def check_genes(self):
         self.Warning.missing_entrez_id.clear()
@@ -338,6 +396,8 @@ class OWDropout(OWWidget):
 
     def select_genes(self):
         self.selected = None
+        self.__results = None
+        self.__graph_outdated = False
         self.graph.clear_all()
         self.Warning.less_selected.clear()
         if not self.data:
@@ -345,8 +405,9 @@ class OWDropout(OWWidget):
 
         selector = self.__get_selector()
         self.zero_rate, self.mean_expr = selector.detection(self.data.X)
-        results = self.__select(selector)
-        self.graph.set_data(DropoutResults(*results), self.data, self.genes)
+        self.__results = self.__select(selector)
+        self.__draw(lambda: self.graph.set_data(self.__results, self.data,
+                                                self.genes))
 
     def __get_selector(self):
         kwargs = {"decay": self.decay, "y_offset": self.y_offset}
@@ -356,34 +417,49 @@ class OWDropout(OWWidget):
             kwargs["x_offset"] = self.x_offset
         return DropoutGeneSelection(**kwargs)
 
-    def __select(self, selector):
+    def __select(self, selector) -> DropoutResults:
         self.selected = selector.select_genes(self.zero_rate, self.mean_expr)
-        n_selected = sum(self.selected)
+        self.__selected_idx = np.flatnonzero(self.selected)
+        n_selected = len(self.__selected_idx)
         if n_selected < self.n_genes and self.filter_by_nr_of_genes:
             self.Warning.less_selected(n_selected)
         self.n_genes = n_selected
         self.decay = selector.decay
         self.x_offset = selector.x_offset
         self.y_offset = selector.y_offset
-        return (self.zero_rate, self.mean_expr, selector.decay,
-                selector.x_offset, selector.y_offset, selector.threshold)
+        return DropoutResults(self.zero_rate, self.mean_expr, selector.decay,
+                              selector.x_offset, selector.y_offset,
+                              selector.threshold)
 
     def update_selection(self):
         self.Warning.less_selected.clear()
         if not self.data:
             return
         selector = self.__get_selector()
-        self.graph.update_curve(DropoutResults(*self.__select(selector)))
+        self.__results = self.__select(selector)
+        self.__draw(lambda: self.graph.update_curve(self.__results))
+
+    def __draw(self, draw: Callable[[], None]):
+        # drawing is deferred while the widget is hidden; see showEvent
+        if self.graph.isVisible():
+            draw()
+        else:
+            self.__graph_outdated = True
+
+    def __draw_outdated(self):
+        if self.__graph_outdated:
+            self.__graph_outdated = False
+            if self.__results is not None:
+                self.graph.set_data(self.__results, self.data, self.genes)
 
     def setup_info_label(self):
         text = "No data on input."
         if self.selected is not None:
-            k = sum(self.selected)
+            k = len(self.__selected_idx)
             n, m = len(self.data), len(self.data.domain.attributes)
-            ks = "s" if k != 1 else ""
-            ns, ms = "s" if n != 1 else "", "s" if m != 1 else ""
-            text = f"Data with {n} cell{ns} and {m} gene{ms}" \
-                   f"\n{k} gene{ks} in selection"
+            text = f"Data with {n} {pl(n, 'cell')} and {m} {pl(m, 'gene')}" \
+                   f"\n{k} {pl(k, 'gene')} in selection"
+        # QLabel.setText is a no-op (no relayout) if the text is unchanged
         self.info_label.setText(text)
 
     def enable_controls(self):
@@ -394,18 +470,28 @@ class OWDropout(OWWidget):
 
     @gui.deferred
     def commit(self):
+        # the output for this data and selection has already been sent
+        if self.selected is not None and self.__sent_selected is not None \
+                and np.array_equal(self.selected, self.__sent_selected):
+            return
+        self.__sent_selected = self.selected
         data = None
         if self.selected is not None:
             data = DropoutGeneSelection.filter_columns(self.data,
-                                                       self.selected)
+                                                       self.__selected_idx)
         self.Outputs.data.send(data)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.__draw_outdated()
+
     def sizeHint(self):
         return super().sizeHint().expandedTo(QSize(800, 400))
 
     def send_report(self):
         if self.selected is None:
             return
+        self.__draw_outdated()
         self.report_plot()
         self.report_caption(report.render_items_vert((
             ("Number of genes", self.n_genes),